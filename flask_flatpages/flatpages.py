@@ -1,5 +1,7 @@
 """Flatpages extension."""
 
+import copy
+import hashlib
 import operator
 import os
 import warnings
@@ -22,6 +24,7 @@ from yaml import (
 )
 
 
+from .imports import scandir
 from .page import Page
 from .utils import force_unicode, NamedStringIO, pygmented_markdown
 
@@ -57,6 +60,14 @@ def _check_continue_parsing_tokens(token):
     )
 
 
+def _file_fingerprint(stat_result):
+    """Return the ``(mtime, size)`` pair used to detect changed files."""
+    mtime = getattr(stat_result, "st_mtime_ns", None)
+    if mtime is None:  # Python 2 only has the float mtime
+        mtime = stat_result.st_mtime
+    return mtime, stat_result.st_size
+
+
 class FlatPages(object):
     """A collection of :class:`Page` objects."""
 
@@ -102,9 +113,15 @@ class FlatPages(object):
         else:
             self.config_prefix = "_".join(("FLATPAGES", name.upper()))
 
-        #: dict of filename: (page object, mtime when loaded)
+        #: dict of filename: (page object, (mtime, size) when loaded)
         self._file_cache = {}
 
+        #: dict of page path: (render key, html) of the last rendering
+        self._render_cache = {}
+
+        #: Markdown settings of the rendered HTML, checked by :meth:`reload`
+        self._reload_settings = None
+
         if app:
             self.init_app(app)
 
@@ -198,7 +215,9 @@ class FlatPages(object):
     def reload(self):
         """Forget all pages.
 
-        All pages will be reloaded next time they're accessed.
+        All pages will be reloaded next time they're accessed. If the Markdown
+        settings changed since the last reload, the HTML of unchanged pages
+        is rendered again too, so the new settings apply.
         """
         try:
             # This will "unshadow" the cached_property.
@@ -206,6 +225,17 @@ class FlatPages(object):
             del self.__dict__["_pages"]
         except KeyError:
             pass
+        if not self._file_cache:
+            return
+        if self._html_renderer() is not pygmented_markdown:
+            # Only the default renderer depends on the Markdown settings
+            return
+        settings = self._markdown_settings()
+        if settings != self._reload_settings:
+            self._reload_settings = settings
+            # Copy, as another thread loading pages may add to the cache
+            for page, _ in list(self._file_cache.values()):
+                page.__dict__.pop("html", None)
 
     @property
     def root(self):
@@ -233,16 +263,17 @@ class FlatPages(object):
         if auto:
             self.reload()
 
-    def _load_file(self, path, filename, rel_path):
+    def _load_file(self, path, filename, rel_path, fingerprint):
         """
         Load file from file system and cache it.
 
-        We store the result as a tuple of :class:`Path` and the file `mtime`.
+        We store the result as a tuple of :class:`Path` and the file
+        `fingerprint`, the ``(mtime, size)`` pair read by the directory walk.
+        The file is only opened again when either of them changes.
         """
-        mtime = os.path.getmtime(filename)
         cached = self._file_cache.get(filename)
 
-        if cached and cached[1] == mtime:
+        if cached and cached[1] == fingerprint:
             page = cached[0]
         else:
             encoding = self.config("encoding")
@@ -255,7 +286,7 @@ class FlatPages(object):
                     content = handler.read().decode(encoding)
 
             page = self._parse(content, path, rel_path)
-            self._file_cache[filename] = (page, mtime)
+            self._file_cache[filename] = (page, fingerprint)
 
         return page
 
@@ -267,31 +298,50 @@ class FlatPages(object):
         Returns a dictionary of pages keyed by their path.
         """
 
-        def _walker():
+        def _walker(cur_path, path_prefix=()):
             """
             Walk over directory and find all possible flatpages.
 
             Returns files which end with the string or sequence given by
-            ``FLATPAGES_%(name)s_EXTENSION``.
+            ``FLATPAGES_%(name)s_EXTENSION``, along with their fingerprint.
+            Like :func:`os.walk`, unreadable directories are skipped and
+            symlinks to directories are not followed.
             """
-            for cur_path, _, filenames in os.walk(self.root):
-                rel_path = cur_path.replace(self.root, "").lstrip(os.sep)
-                path_prefix = tuple(rel_path.split(os.sep)) if rel_path else ()
-
-                for name in filenames:
-                    if not name.endswith(extension):
-                        continue
-
-                    full_name = os.path.join(cur_path, name)
-                    name_without_extension = [
-                        name[: -len(item)]
-                        for item in extension
-                        if name.endswith(item)
-                    ][0]
-                    path = "/".join(path_prefix + (name_without_extension,))
-                    if self.config("case_insensitive"):
-                        path = path.lower()
-                    yield (path, full_name, rel_path)
+            try:
+                entries = list(scandir(cur_path))
+            except OSError:
+                return
+            rel_path = os.sep.join(path_prefix)
+            subdirs = []
+
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry)
+                    continue
+
+                name = entry.name
+                if not name.endswith(extension):
+                    continue
+
+                name_without_extension = [
+                    name[: -len(item)]
+                    for item in extension
+                    if name.endswith(item)
+                ][0]
+                path = "/".join(path_prefix + (name_without_extension,))
+                if case_insensitive:
+                    path = path.lower()
+                fingerprint = _file_fingerprint(entry.stat())
+                yield (path, entry.path, rel_path, fingerprint)
+
+            for entry in subdirs:
+                for item in _walker(entry.path, path_prefix + (entry.name,)):
+                    yield item
 
         # Read extension from config
         extension = self.config("extension")
@@ -313,14 +363,30 @@ class FlatPages(object):
                     type(extension).__name__, extension
                 )
             )
+        case_insensitive = self.config("case_insensitive")
+        if (
+            self._reload_settings is None
+            and self._html_renderer() is pygmented_markdown
+        ):
+            # Loaded pages are rendered with the current Markdown settings
+            self._reload_settings = self._markdown_settings()
         pages = {}
-        for path, full_name, rel_path in _walker():
+        for path, full_name, rel_path, fingerprint in _walker(self.root):
             if path in pages:
                 raise ValueError(
                     "Multiple pages found which correspond to the same path. "
                     "This error can arise when using multiple extensions."
                 )
-            pages[path] = self._load_file(path, full_name, rel_path)
+            pages[path] = self._load_file(
+                path, full_name, rel_path, fingerprint
+            )
+        # Forget the HTML of deleted or renamed pages. Copy, as pages of
+        # the previous walk may still be rendered by another thread.
+        self._render_cache = dict(
+            (path, cached)
+            for path, cached in list(self._render_cache.items())
+            if path in pages
+        )
         return pages
 
     def _libyaml_parser(self, content, path):
@@ -333,7 +399,6 @@ class FlatPages(object):
             meta = ""
             content = content.lstrip("\n")
         else:
-            lines = content.split("\n")
             if isinstance(token, DocumentStartToken):
                 token = yaml_loader.get_token()
             newline_token = None
@@ -347,12 +412,22 @@ class FlatPages(object):
             if token is None and newline_token is None:
                 meta = content
                 content = ""
-            else:
-                if token is not None:
-                    meta_end_line = token.end_mark.line + 1
+            elif token is not None:
+                # Metadata runs to the end of the line holding the last
+                # token, so slice there rather than splitting the whole body
+                # into lines.
+                meta_end = content.find("\n", token.end_mark.index)
+                if meta_end == -1:
+                    meta = content
+                    content = ""
                 else:
-                    meta_end_line = newline_token.start_mark.line
-                    meta_end_line += lines[meta_end_line:].index("")
+                    body_start = meta_end + 1
+                    meta = content[:meta_end]
+                    content = content[body_start:].lstrip("\n")
+            else:
+                lines = content.split("\n")
+                meta_end_line = newline_token.start_mark.line
+                meta_end_line += lines[meta_end_line:].index("")
                 meta = "\n".join(lines[:meta_end_line])
                 content = "\n".join(lines[meta_end_line:]).lstrip("\n")
         if not six.PY3:
@@ -380,11 +455,7 @@ class FlatPages(object):
             meta, content = self._libyaml_parser(content, path)
 
         # Now we ready to get HTML renderer function
-        html_renderer = self.config("html_renderer")
-
-        # If function is not callable yet, import it
-        if not callable(html_renderer):
-            html_renderer = import_string(html_renderer)
+        html_renderer = self._html_renderer()
 
         # Make able to pass custom arguments to renderer function
         html_renderer = self._smart_html_renderer(html_renderer)
@@ -395,6 +466,15 @@ class FlatPages(object):
         # Initialize and return Page instance
         return Page(path, meta, content, html_renderer, folder)
 
+    def _html_renderer(self):
+        """Return the configured HTML renderer function."""
+        html_renderer = self.config("html_renderer")
+
+        # If function is not callable yet, import it
+        if not callable(html_renderer):
+            html_renderer = import_string(html_renderer)
+        return html_renderer
+
     def _smart_html_renderer(self, html_renderer):
         """
         Wrappper to enable  rendering functions with differing signatures.
@@ -416,6 +496,16 @@ class FlatPages(object):
            :class:`FlatPages`.
 
         """
+        # Inspect the signature once, not on every render.
+        try:
+            args_length = len(getfullargspec(html_renderer).args)
+        except TypeError:
+            args_length = None
+        # Only renderers reading nothing but the body, and the default one
+        # whose other inputs are the Markdown settings, can be cached.
+        cacheable = (
+            args_length in (None, 1) or html_renderer is pygmented_markdown
+        )
 
         def wrapper(page):
             """Wrap HTML renderer function.
@@ -425,26 +515,69 @@ class FlatPages(object):
             * 1 argument -> page body
             * 2 arguments -> page body, flatpages instance
             * 3 arguments -> page body, flatpages instance, page instance
+
+            For renderers taking only the body and for the default one,
+            the HTML is kept in :attr:`_render_cache`, so a page re-read
+            from disk with an unchanged body (e.g. only its metadata was
+            edited) is not rendered again.
             """
             body = page.body
 
-            try:
-                args_length = len(getfullargspec(html_renderer).args)
-            except TypeError:
-                return html_renderer(body)
+            if args_length == 3:
+                return html_renderer(body, self, page)
+            elif args_length not in (None, 1, 2):
+                raise ValueError(
+                    "HTML renderer function {0!r} not supported by "
+                    "Flask-FlatPages, wrong number of arguments: {1}.".format(
+                        html_renderer, args_length
+                    )
+                )
 
-            if args_length == 1:
-                return html_renderer(body)
-            elif args_length == 2:
+            if not cacheable:
                 return html_renderer(body, self)
-            elif args_length == 3:
-                return html_renderer(body, self, page)
 
-            raise ValueError(
-                "HTML renderer function {0!r} not supported by "
-                "Flask-FlatPages, wrong number of arguments: {1}.".format(
-                    html_renderer, args_length
-                )
-            )
+            key = self._render_key(html_renderer, body)
+            cached = self._render_cache.get(page.path)
+            if cached and cached[0] == key:
+                return cached[1]
+
+            if args_length == 2:
+                html = html_renderer(body, self)
+            else:
+                html = html_renderer(body)
+            self._render_cache[page.path] = (key, html)
+            return html
 
         return wrapper
+
+    def _render_key(self, html_renderer, body):
+        """Return the key identifying the rendering of ``body``.
+
+        Besides the renderer and the body, the output of the default renderer
+        depends on the Markdown settings, so they are part of its key as
+        well. The body is stored as a digest to keep the cache small.
+        """
+        if html_renderer is pygmented_markdown:
+            settings = self._markdown_settings()
+        else:
+            settings = None
+        return (
+            html_renderer,
+            settings,
+            hashlib.sha1(body.encode("utf-8")).digest(),
+        )
+
+    def _markdown_settings(self):
+        """Return the configured Markdown extensions and their configs.
+
+        The extensions are copied to a list and the configs deep copied, so
+        they compare by value where possible and by identity otherwise, e.g.
+        for extension objects or callables such as a ``slugify`` function.
+        The copies keep those objects alive, so a new object can't be
+        mistaken for an old one at the same address, and later in-place
+        edits of the configs are noticed.
+        """
+        return (
+            list(self.config("markdown_extensions") or ()),
+            copy.deepcopy(self.config("extension_configs")),
+        )
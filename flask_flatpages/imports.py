@@ -4,3 +4,13 @@ try:
     from pygments.formatters import HtmlFormatter as PygmentsHtmlFormatter
 except ImportError:
     PygmentsHtmlFormatter = None
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader  # noqa
+
+try:
+    from os import scandir
+except ImportError:  # Python < 3.5
+    from scandir import scandir  # noqa
@@ -1,12 +1,12 @@
 """Define flatpage instance."""
 
-from io import StringIO
-
-
 import yaml
 from werkzeug.utils import cached_property
 
 
+from .imports import YamlSafeLoader
+
+
 class Page(object):
     """Simple class to store all necessary information about a flatpage.
 
@@ -64,7 +64,7 @@ class Page(object):
         """Store a dict of metadata parsed from the YAML header of the file."""
         # meta = yaml.safe_load(self._meta)
         meta = {}
-        for doc in yaml.safe_load_all(StringIO(self._meta)):
+        for doc in yaml.load_all(self._meta, Loader=YamlSafeLoader):
             if doc is not None:
                 meta.update(doc)
         # YAML documents can be any type but we want a dict
@@ -1,5 +1,8 @@
 """Utility functions to render Markdown text to HTML."""
 
+import copy
+import threading
+
 import markdown
 import six
 from markdown.extensions import codehilite
@@ -12,6 +15,13 @@ else:
     from StringIO import StringIO
 
 
+#: dict of Pygments style: CSS definitions, see :func:`pygments_style_defs`
+_STYLE_DEFS_CACHE = {}
+
+#: Per thread Markdown converter, see :func:`_markdown_convert`
+_MARKDOWN = threading.local()
+
+
 class NamedStringIO(StringIO, object):
     """Subclass adding a Name to :class:`StringIO` objects."""
 
@@ -37,6 +47,40 @@ def force_unicode(value, encoding="utf-8", errors="strict"):
     return value.decode(encoding, errors)
 
 
+def _markdown_convert(text, extensions, extension_configs):
+    """Render ``text`` with a :class:`markdown.Markdown` for the extensions.
+
+    Building a converter loads and registers every extension, so the last
+    one is kept per thread and reused, after a ``reset()``, while the
+    extension settings are unchanged. Holding copies of the extensions list
+    and of the configs also keeps extension objects and config callables
+    alive, so they can't be mistaken for new objects at the same address.
+
+    A conversion started while another one runs on the same thread, e.g. by
+    an extension rendering another page, gets a converter of its own:
+    resetting the shared one would discard the outer document's state.
+    """
+    if getattr(_MARKDOWN, "busy", False):
+        return markdown.Markdown(
+            extensions=extensions, extension_configs=extension_configs
+        ).convert(text)
+    extensions = list(extensions)
+    if (
+        getattr(_MARKDOWN, "extensions", None) != extensions
+        or _MARKDOWN.extension_configs != extension_configs
+    ):
+        _MARKDOWN.converter = markdown.Markdown(
+            extensions=extensions, extension_configs=extension_configs
+        )
+        _MARKDOWN.extensions = extensions
+        _MARKDOWN.extension_configs = copy.deepcopy(extension_configs)
+    _MARKDOWN.busy = True
+    try:
+        return _MARKDOWN.converter.reset().convert(text)
+    finally:
+        _MARKDOWN.busy = False
+
+
 def pygmented_markdown(text, flatpages=None):
     """Render Markdown text to HTML.
 
@@ -80,9 +124,7 @@ def pygmented_markdown(text, flatpages=None):
                     extension_configs[extension] = original_config[extension]
     elif not extensions:
         extensions = ["codehilite"]
-    return markdown.markdown(
-        text, extensions=extensions, extension_configs=extension_configs
-    )
+    return _markdown_convert(text, extensions, extension_configs)
 
 
 def pygments_style_defs(style="default"):
@@ -90,12 +132,19 @@ def pygments_style_defs(style="default"):
 
     :param style: The Pygments `style`_ to use.
 
-    Only available if `Pygments`_ is.
+    Only available if `Pygments`_ is. The definitions are generated once per
+    style and cached.
 
     .. _CodeHilite:
        http://www.freewisdom.org/projects/python-markdown/CodeHilite
     .. _Pygments: http://pygments.org/
     .. _style: http://pygments.org/docs/styles/
     """
+    try:
+        return _STYLE_DEFS_CACHE[style]
+    except KeyError:
+        pass
     formatter = PygmentsHtmlFormatter(style=style)
-    return formatter.get_style_defs(".codehilite")
+    style_defs = formatter.get_style_defs(".codehilite")
+    _STYLE_DEFS_CACHE[style] = style_defs
+    return style_defs
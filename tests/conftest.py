@@ -0,0 +1,31 @@
+"""
+==============
+tests.conftest
+==============
+
+Fixtures shared by the Markdown rendering tests.
+
+"""
+
+import pytest
+from flask import Flask
+from flask_flatpages import FlatPages
+
+
+@pytest.fixture(scope='session')
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture(scope='session')
+def session_pages(app):
+    return FlatPages(app)
+
+
+@pytest.fixture
+def pages(app, session_pages):
+    """Shared FlatPages instance, reset to the default Markdown config."""
+    app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = ['codehilite']
+    app.config['FLATPAGES_EXTENSION_CONFIGS'] = {}
+    session_pages.reload()
+    return session_pages
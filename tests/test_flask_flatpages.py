@@ -21,13 +21,19 @@ import six
 import yaml
 import pytest
 from flask import Flask
-from flask_flatpages import FlatPages, pygments_style_defs
+from flask_flatpages import FlatPages, pygments_style_defs, utils
 from flask_flatpages.imports import PygmentsHtmlFormatter
+from flask_flatpages.utils import _markdown_convert
+from markdown.extensions import Extension
+from markdown.extensions.toc import TocExtension
+from markdown.inlinepatterns import InlineProcessor
 from werkzeug.exceptions import NotFound
 
 from .test_temp_directory import temp_directory
 
-if six.PY3:
+_PY3 = six.PY3
+
+if _PY3:
     utc = datetime.timezone.utc
     from unittest.mock import patch
 else:
@@ -36,6 +42,10 @@ else:
     from mock import patch
 
 
+#: Shared application for tests which never touch ``app.config``.
+_SHARED_APP = Flask(__name__)
+
+
 @contextmanager
 def temp_pages(app=None, name=None):
     """
@@ -61,51 +71,109 @@ def temp_pages(app=None, name=None):
         yield FlatPages(app, name)
 
 
-class TestFlatPages(unittest.TestCase):
+def write_file(filename, content):
+    """Replace the content of ``filename`` with ``content``."""
+    with open(filename, 'w') as fd:
+        fd.write(content)
+
+
+def _check_auto_reset(pages):
+    bar = pages.get('foo/bar')
+    assert bar.body == ''
+
+    filename = os.path.join(pages.root, 'foo', 'bar.html')
+    write_file(filename, '\nrewritten')
+
+    # simulate a request (before_request functions are called)
+    # pages.reload() is not call explicitly
+    with pages.app.test_request_context():
+        pages.app.preprocess_request()
+
+    # updated
+    bar2 = pages.get('foo/bar')
+    assert bar2.body == 'rewritten'
+    assert bar2 is not bar
+
+
+def _check_no_auto_reset(pages):
+    bar = pages.get('foo/bar')
+    assert bar.body == ''
+
+    filename = os.path.join(pages.root, 'foo', 'bar.html')
+    write_file(filename, '\nrewritten')
+
+    # simulate a request (before_request functions are called)
+    with pages.app.test_request_context():
+        pages.app.preprocess_request()
+
+    # not updated
+    bar2 = pages.get('foo/bar')
+    assert bar2.body == ''
+    assert bar2 is bar
+
+
+def _check_unicode_page(pages):
+    hello = pages.get('hello')
+    assert hello.meta == {'title': u'世界', 'template': 'article.html'}
+    assert hello['title'] == u'世界'
+    assert hello.body == u'Hello, *世界*!\n'
+    # Markdown
+    assert hello.html == u'<p>Hello, <em>世界</em>!</p>'
+
+
+class _IncludeProcessor(InlineProcessor):
+    """Replace ``[[include]]`` with HTML rendered by the same extensions."""
+
+    def __init__(self, pattern, md, extensions):
+        super(_IncludeProcessor, self).__init__(pattern, md)
+        self.extensions = extensions
+
+    def handleMatch(self, m, data):
+        html = _markdown_convert('<b>raw</b>', self.extensions, {})
+        return self.md.htmlStash.store(html), m.start(0), m.end(0)
 
-    def assert_auto_reset(self, pages):
-        bar = pages.get('foo/bar')
-        self.assertEqual(bar.body, '')
-
-        filename = os.path.join(pages.root, 'foo', 'bar.html')
-        with open(filename, 'w') as fd:
-            fd.write('\nrewritten')
-
-        # simulate a request (before_request functions are called)
-        # pages.reload() is not call explicitly
-        with pages.app.test_request_context():
-            pages.app.preprocess_request()
-
-        # updated
-        bar2 = pages.get('foo/bar')
-        self.assertEqual(bar2.body, 'rewritten')
-        self.assertTrue(bar2 is not bar)
-
-    def assert_no_auto_reset(self, pages):
-        bar = pages.get('foo/bar')
-        self.assertEqual(bar.body, '')
-
-        filename = os.path.join(pages.root, 'foo', 'bar.html')
-        with open(filename, 'w') as fd:
-            fd.write('\nrewritten')
-
-        # simulate a request (before_request functions are called)
-        with pages.app.test_request_context():
-            pages.app.preprocess_request()
-
-        # not updated
-        bar2 = pages.get('foo/bar')
-        self.assertEqual(bar2.body, '')
-        self.assertTrue(bar2 is bar)
-
-    def assert_unicode(self, pages):
-        hello = pages.get('hello')
-        self.assertEqual(hello.meta, {'title': u'世界',
-                                      'template': 'article.html'})
-        self.assertEqual(hello['title'], u'世界')
-        self.assertEqual(hello.body, u'Hello, *世界*!\n')
-        # Markdown
-        self.assertEqual(hello.html, u'<p>Hello, <em>世界</em>!</p>')
+
+class _IncludeExtension(Extension):
+
+    def extendMarkdown(self, md):
+        # Run after the outer document's inline HTML has been stashed
+        processor = _IncludeProcessor(r'\[\[include\]\]', md, [self])
+        md.inlinePatterns.register(processor, 'include', 10)
+
+
+class _TocExtension(TocExtension):
+    """Table of contents extension with the same repr for all instances."""
+
+    def __repr__(self):
+        return '<TocExtension>'
+
+
+class _Slugify(object):
+    """Slugify function for the toc extension, with a constant repr."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __call__(self, value, separator):
+        return self.prefix + value.lower().replace(' ', separator)
+
+    def __repr__(self):
+        return '<slugify>'
+
+
+def _body_renderer(body):
+    return body.upper()
+
+
+def _page_renderer(body, pages, page):
+    return page.body.upper()
+
+
+def _pages_renderer(body, pages):
+    return pages.get('hello').body.upper()
+
+
+class TestFlatPages(unittest.TestCase):
 
     def test_caching(self):
         with temp_pages() as pages:
@@ -113,8 +181,7 @@ class TestFlatPages(unittest.TestCase):
             bar = pages.get('foo/bar')
 
             filename = os.path.join(pages.root, 'foo', 'bar.html')
-            with open(filename, 'w') as fd:
-                fd.write('\nrewritten')
+            write_file(filename, '\nrewritten')
 
             pages.reload()
 
@@ -127,21 +194,39 @@ class TestFlatPages(unittest.TestCase):
             self.assertTrue(bar2 is not bar)
             self.assertTrue(bar2.body != bar.body)
 
+    @pytest.mark.skipif(not _PY3, reason='Needs nanosecond os.utime')
+    def test_caching_same_mtime(self):
+        with temp_pages() as pages:
+            bar = pages.get('foo/bar')
+
+            filename = os.path.join(pages.root, 'foo', 'bar.html')
+            stat = os.stat(filename)
+            write_file(filename, '\nrewritten')
+            # Same timestamp, as with a coarse filesystem mtime resolution
+            os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            pages.reload()
+
+            # The size changed, so the file is parsed again.
+            bar2 = pages.get('foo/bar')
+            self.assertTrue(bar2 is not bar)
+            self.assertEqual(bar2.body, 'rewritten')
+
     def test_configured_auto_reset(self):
         app = Flask(__name__)
         app.config['FLATPAGES_AUTO_RELOAD'] = True
         with temp_pages(app) as pages:
-            self.assert_auto_reset(pages)
+            _check_auto_reset(pages)
 
     def test_configured_no_auto_reset(self):
         app = Flask(__name__)
         app.debug = True
         app.config['FLATPAGES_AUTO_RELOAD'] = False
         with temp_pages(app) as pages:
-            self.assert_no_auto_reset(pages)
+            _check_no_auto_reset(pages)
 
     def test_consistency(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         for page in pages:
             assert pages.get(page.path) is page
 
@@ -149,43 +234,11 @@ class TestFlatPages(unittest.TestCase):
         app = Flask(__name__)
         app.debug = True
         with temp_pages(app) as pages:
-            self.assert_auto_reset(pages)
+            _check_auto_reset(pages)
 
     def test_default_no_auto_reset(self):
         with temp_pages() as pages:
-            self.assert_no_auto_reset(pages)
-
-    def test_extension_comma(self):
-        self.test_extension_sequence('.html,.txt')
-
-    def test_extension_sequence(self, extension=None):
-        app = Flask(__name__)
-        app.config['FLATPAGES_EXTENSION'] = extension or ['.html', '.txt']
-        pages = FlatPages(app)
-        self.assertEqual(
-            set(page.path for page in pages),
-            set(['codehilite',
-                 'extra',
-                 'foo',
-                 'foo/42/not_a_page',
-                 'foo/bar',
-                 'foo/lorem/ipsum',
-                 'headerid',
-                 'hello',
-                 'meta_styles/closing_block_only',
-                 'meta_styles/yaml_style',
-                 'meta_styles/jekyll_style',
-                 'meta_styles/multi_line',
-                 'meta_styles/no_meta',
-                 'not_a_page',
-                 'toc'])
-        )
-
-    def test_extension_set(self):
-        self.test_extension_sequence(set(['.html', '.txt']))
-
-    def test_extension_tuple(self):
-        self.test_extension_sequence(('.html', '.txt'))
+            _check_no_auto_reset(pages)
 
     def test_catch_conflicting_paths(self):
         app = Flask(__name__)
@@ -230,18 +283,18 @@ class TestFlatPages(unittest.TestCase):
             self.assertRaises(ValueError, pages.get, 'hello')
 
     def test_get(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         self.assertEqual(pages.get('foo/bar').path, 'foo/bar')
         self.assertEqual(pages.get('nonexistent'), None)
         self.assertEqual(pages.get('nonexistent', 42), 42)
 
     def test_get_or_404(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         self.assertEqual(pages.get_or_404('foo/bar').path, 'foo/bar')
         self.assertRaises(NotFound, pages.get_or_404, 'nonexistent')
 
     def test_iter(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         self.assertEqual(
             set(page.path for page in pages),
             set(['codehilite',
@@ -277,11 +330,168 @@ class TestFlatPages(unittest.TestCase):
             self.assertEqual(bar.body, 'c')
 
     def test_markdown(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         foo = pages.get('foo')
         self.assertEqual(foo.body, 'Foo *bar*\n')
         self.assertEqual(foo.html, '<p>Foo <em>bar</em></p>')
 
+    def test_markdown_converter_reused(self):
+        self.assertEqual(
+            _markdown_convert('# Header', ['toc'], {}),
+            '<h1 id="header">Header</h1>'
+        )
+        converter = utils._MARKDOWN.converter
+        _markdown_convert('# Header', ('toc', ), {})
+        self.assertTrue(utils._MARKDOWN.converter is converter)
+
+        self.assertEqual(
+            _markdown_convert(
+                '# Header', ['toc'], {'toc': {'permalink': True}}
+            ),
+            '<h1 id="header">Header<a class="headerlink" href="#header" '
+            'title="Permanent link">&para;</a></h1>'
+        )
+        self.assertTrue(utils._MARKDOWN.converter is not converter)
+
+        # Same repr, but a different callable
+        for prefix in ('a-', 'b-'):
+            configs = {'toc': {'slugify': _Slugify(prefix)}}
+            self.assertEqual(
+                _markdown_convert('# Header', ['toc'], configs),
+                '<h1 id="%sheader">Header</h1>' % prefix
+            )
+
+    def test_nested_markdown_conversion(self):
+        extensions = [_IncludeExtension()]
+        self.assertEqual(
+            _markdown_convert('outer <i>raw</i> [[include]]', extensions, {}),
+            '<p>outer <i>raw</i> <p><b>raw</b></p></p>'
+        )
+
+    def test_html_reused_for_unchanged_body(self):
+        rendered = []
+
+        def renderer(body):
+            rendered.append(body)
+            return body.upper()
+
+        app = Flask(__name__)
+        app.config['FLATPAGES_HTML_RENDERER'] = renderer
+        with temp_pages(app) as pages:
+            filename = os.path.join(pages.root, 'foo', 'bar.html')
+            write_file(filename, 'a: b\n\nrewritten')
+            bar = pages.get('foo/bar')
+            self.assertEqual(bar.html, 'REWRITTEN')
+
+            # Only the metadata changes
+            write_file(filename, 'title: changed\n\nrewritten')
+            pages.reload()
+            bar2 = pages.get('foo/bar')
+            self.assertTrue(bar2 is not bar)
+            self.assertEqual(bar2.meta, {'title': 'changed'})
+            self.assertEqual(bar2.html, 'REWRITTEN')
+            self.assertEqual(rendered, ['rewritten'])
+
+            write_file(filename, 'title: changed\n\nrewritten again')
+            pages.reload()
+            self.assertEqual(pages.get('foo/bar').html, 'REWRITTEN AGAIN')
+            self.assertEqual(rendered, ['rewritten', 'rewritten again'])
+
+    def test_render_cache_pruned(self):
+        app = Flask(__name__)
+        app.config['FLATPAGES_HTML_RENDERER'] = _body_renderer
+        with temp_pages(app) as pages:
+            self.assertEqual(pages.get('foo/bar').html, '')
+            self.assertTrue('foo/bar' in pages._render_cache)
+
+            os.remove(os.path.join(pages.root, 'foo', 'bar.html'))
+            pages.reload()
+            self.assertTrue(pages.get('foo/bar') is None)
+            self.assertTrue('foo/bar' not in pages._render_cache)
+
+    def test_html_rendered_again_for_new_extension(self):
+        app = Flask(__name__)
+        app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = [_TocExtension()]
+        with temp_pages(app) as pages:
+            self.assertTrue('headerlink' not in pages.get('headerid').html)
+
+            # Same repr, but a different extension object
+            app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = [
+                _TocExtension(permalink=True)
+            ]
+            pages.reload()
+            self.assertTrue('headerlink' in pages.get('headerid').html)
+
+    def test_html_rendered_again_for_new_extension_config(self):
+        app = Flask(__name__)
+        app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = ['toc']
+        app.config['FLATPAGES_EXTENSION_CONFIGS'] = {
+            'toc': {'slugify': _Slugify('a-')}
+        }
+        with temp_pages(app) as pages:
+            self.assertTrue('id="a-page-header"' in pages.get('headerid').html)
+
+            # Same repr, but a different callable
+            app.config['FLATPAGES_EXTENSION_CONFIGS'] = {
+                'toc': {'slugify': _Slugify('b-')}
+            }
+            pages.reload()
+            self.assertTrue('id="b-page-header"' in pages.get('headerid').html)
+
+            # Edited in place
+            app.config['FLATPAGES_EXTENSION_CONFIGS']['toc']['slugify'] = (
+                _Slugify('c-')
+            )
+            pages.reload()
+            self.assertTrue('id="c-page-header"' in pages.get('headerid').html)
+
+    def test_html_not_reused_with_pages_renderer(self):
+        def renderer(body, pages):
+            return body + pages.get('hello').meta['title']
+
+        app = Flask(__name__)
+        app.config['FLATPAGES_HTML_RENDERER'] = renderer
+        with temp_pages(app) as pages:
+            self.assertEqual(pages.get('foo').html, u'Foo *bar*\n世界')
+
+            write_file(os.path.join(pages.root, 'hello.html'), 'title: new')
+            # Only the metadata of foo changes
+            write_file(
+                os.path.join(pages.root, 'foo.html'),
+                'title: changed\n\nFoo *bar*\n'
+            )
+            pages.reload()
+            self.assertEqual(pages.get('foo').html, 'Foo *bar*\nnew')
+
+    def test_html_kept_on_reload_with_same_settings(self):
+        rendered = []
+
+        def renderer(body, pages, page):
+            rendered.append(page.path)
+            return body.upper()
+
+        app = Flask(__name__)
+        app.config['FLATPAGES_HTML_RENDERER'] = renderer
+        with temp_pages(app) as pages:
+            self.assertEqual(pages.get('foo').html, 'FOO *BAR*\n')
+            pages.reload()
+            self.assertEqual(pages.get('foo').html, 'FOO *BAR*\n')
+            self.assertEqual(rendered, ['foo'])
+
+            # Custom renderers don't depend on the Markdown settings
+            app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = ['toc']
+            pages.reload()
+            self.assertEqual(pages.get('foo').html, 'FOO *BAR*\n')
+            self.assertEqual(rendered, ['foo'])
+
+    def test_markdown_extensions_none(self):
+        app = Flask(__name__)
+        app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = None
+        with temp_pages(app) as pages:
+            self.assertEqual(pages.get('foo').html, '<p>Foo <em>bar</em></p>')
+            pages.reload()
+            self.assertEqual(pages.get('foo').html, '<p>Foo <em>bar</em></p>')
+
     def test_instance_relative(self):
         with temp_directory() as temp:
             source = os.path.join(os.path.dirname(__file__), 'pages')
@@ -346,7 +556,7 @@ class TestFlatPages(unittest.TestCase):
         app.config['FLATPAGES_ENCODING'] = 'shift_jis'
         app.config['FLATPAGES_ROOT'] = 'pages_shift_jis'
         pages = FlatPages(app)
-        self.assert_unicode(pages)
+        _check_unicode_page(pages)
 
     def test_other_extension(self):
         app = Flask(__name__)
@@ -357,37 +567,12 @@ class TestFlatPages(unittest.TestCase):
             set(['not_a_page', 'foo/42/not_a_page'])
         )
 
-    def test_other_html_renderer(self):
-        def body_renderer(body):
-            return body.upper()
-
-        def page_renderer(body, pages, page):
-            return page.body.upper()
-
-        def pages_renderer(body, pages):
-            return pages.get('hello').body.upper()
-
-        renderers = filter(None, (
-            operator.methodcaller('upper'),
-            'string.upper' if not six.PY3 else None,
-            body_renderer,
-            page_renderer,
-            pages_renderer
-        ))
-
-        for renderer in (renderers):
-            pages = FlatPages(Flask(__name__))
-            pages.app.config['FLATPAGES_HTML_RENDERER'] = renderer
-            hello = pages.get('hello')
-            self.assertEqual(hello.body, u'Hello, *世界*!\n')
-            # Upper-case, markdown not interpreted
-            self.assertEqual(hello.html, u'HELLO, *世界*!\n')
-
     @pytest.mark.skipif(PygmentsHtmlFormatter is None,
                         reason='Pygments not installed')
     def test_pygments_style_defs(self):
         styles = pygments_style_defs()
         self.assertTrue('.codehilite' in styles)
+        self.assertTrue(pygments_style_defs() is styles)
 
     def test_reloading(self):
         with temp_pages() as pages:
@@ -398,10 +583,9 @@ class TestFlatPages(unittest.TestCase):
 
             filename = os.path.join(pages.root, 'foo', 'bar.html')
             # rewrite already loaded page
-            with open(filename, 'w') as fd:
-                # The newline is a separator between the (empty) metadata
-                # and the source 'first'
-                fd.write('\nfirst rewrite')
+            # The newline is a separator between the (empty) metadata
+            # and the source 'first'
+            write_file(filename, '\nfirst rewrite')
 
             bar2 = pages.get('foo/bar')
             # the disk is not hit again until requested
@@ -413,15 +597,13 @@ class TestFlatPages(unittest.TestCase):
             pages.reload()
 
             # write again
-            with open(filename, 'w') as fd:
-                fd.write('\nsecond rewrite')
+            write_file(filename, '\nsecond rewrite')
 
             # get another page
             pages.get('hello')
 
             # write again
-            with open(filename, 'w') as fd:
-                fd.write('\nthird rewrite')
+            write_file(filename, '\nthird rewrite')
 
             # All pages are read at once when any is used
             bar3 = pages.get('foo/bar')
@@ -448,8 +630,8 @@ class TestFlatPages(unittest.TestCase):
             pages.reload()
 
     def test_unicode(self):
-        pages = FlatPages(Flask(__name__))
-        self.assert_unicode(pages)
+        pages = FlatPages(_SHARED_APP)
+        _check_unicode_page(pages)
 
     def test_unicode_filenames(self):
         def safe_unicode(sequence):
@@ -498,7 +680,7 @@ class TestFlatPages(unittest.TestCase):
                      u'Unïcôdé']))
 
     def test_yaml_meta(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         foo = pages.get('foo')
         self.assertEqual(foo.meta, {
             'title': 'Foo > bar',
@@ -524,26 +706,16 @@ class TestFlatPages(unittest.TestCase):
             no_meta = pages.get('meta_styles/no_meta')
             self.assertEqual(no_meta.meta, {})
             filename = os.path.join(pages.root, 'meta_styles', 'no_meta.html')
-            with open(filename, 'w') as f_:
-                f_.write("\n Hello, there's no metadata here.")
-            pages.reload()
-            no_meta = pages.get('meta_styles/no_meta')
-            self.assertEqual(no_meta.meta, {})
-            with open(filename, 'w') as f_:
-                f_.write("---\n---\nHello, there's no metadata here.")
-            pages.reload()
-            no_meta = pages.get('meta_styles/no_meta')
-            self.assertEqual(no_meta.meta, {})
-            with open(filename, 'w') as f_:
-                f_.write("---\n...\nHello, there's no metadata here.")
-            pages.reload()
-            no_meta = pages.get('meta_styles/no_meta')
-            self.assertEqual(no_meta.meta, {})
-            with open(filename, 'w') as f_:
-                f_.write("#Hello, there's no metadata here.")
-            pages.reload()
-            no_meta = pages.get('meta_styles/no_meta')
-            self.assertEqual(no_meta.meta, {})
+            for content in (
+                "\n Hello, there's no metadata here.",
+                "---\n---\nHello, there's no metadata here.",
+                "---\n...\nHello, there's no metadata here.",
+                "#Hello, there's no metadata here.",
+            ):
+                write_file(filename, content)
+                pages.reload()
+                no_meta = pages.get('meta_styles/no_meta')
+                self.assertEqual(no_meta.meta, {})
 
     def test_meta_closing_only(self):
         app = Flask(__name__)
@@ -551,8 +723,7 @@ class TestFlatPages(unittest.TestCase):
             page = pages.get('meta_styles/closing_block_only')
             self.assertEqual(page.meta, {'hello': 'world'})
             filename = os.path.join(pages.root, 'meta_styles', 'closing_block_only.html')
-            with open(filename, 'w') as f:
-                f.write('hello: world\n...\nFoo')
+            write_file(filename, 'hello: world\n...\nFoo')
             pages.reload()
             page = pages.get('meta_styles/closing_block_only')
             self.assertEqual(page.meta, {'hello': 'world'})
@@ -567,8 +738,7 @@ class TestFlatPages(unittest.TestCase):
             filename = os.path.join(pages.root, 'meta_styles', 'jekyll_style.html')
             with open(filename, 'r') as f_:
                 lines = f_.readlines()
-            with open(filename, 'w') as f_:
-                f_.write('\n'.join(lines[1:]))
+            write_file(filename, '\n'.join(lines[1:]))
             pages.reload()
             jekyll_style = pages.get('meta_styles/jekyll_style')
             self.assertEqual(jekyll_style.meta, {'hello': 'world'})
@@ -583,15 +753,14 @@ class TestFlatPages(unittest.TestCase):
             filename = os.path.join(pages.root, 'meta_styles', 'yaml_style.html')
             with open(filename, 'r') as f_:
                 lines = f_.readlines()
-            with open(filename, 'w') as f_:
-                f_.write('\n'.join(lines[1:]))
+            write_file(filename, '\n'.join(lines[1:]))
             pages.reload()
             yaml_style = pages.get('meta_styles/yaml_style')
             self.assertEqual(yaml_style.meta, {'hello': 'world'})
             self.assertEqual(yaml_style.body, 'Foo')
 
     def test_multi_line(self):
-        pages = FlatPages(Flask(__name__))
+        pages = FlatPages(_SHARED_APP)
         multi_line = pages.get('meta_styles/multi_line')
         self.assertEqual(multi_line.body, 'Foo')
         self.assertIn('multi_line_string', multi_line.meta)
@@ -600,11 +769,55 @@ class TestFlatPages(unittest.TestCase):
     def test_parser_error(self):
         app = Flask(__name__)
         with temp_pages(app) as pages:
-            with open(os.path.join(pages.root, 'bad_file_test.html'), 'w') as f:
-                if six.PY3:
-                    f.write("Hello World \u000B")
-                else:
-                    f.write("\x0b".decode('utf-8'))
+            filename = os.path.join(pages.root, 'bad_file_test.html')
+            if _PY3:
+                write_file(filename, "Hello World \u000B")
+            else:
+                write_file(filename, "\x0b".decode('utf-8'))
             with pytest.raises(yaml.reader.ReaderError, match=r".*bad_file_test.*") as excinfo:
                 pages.get('bad_file_test')
 
+
+@pytest.mark.parametrize('extension', [
+    '.html,.txt',
+    ['.html', '.txt'],
+    set(['.html', '.txt']),
+    ('.html', '.txt'),
+], ids=['comma', 'list', 'set', 'tuple'])
+def test_extension_sequence(extension):
+    app = Flask(__name__)
+    app.config['FLATPAGES_EXTENSION'] = extension
+    pages = FlatPages(app)
+    assert set(page.path for page in pages) == set([
+        'codehilite',
+        'extra',
+        'foo',
+        'foo/42/not_a_page',
+        'foo/bar',
+        'foo/lorem/ipsum',
+        'headerid',
+        'hello',
+        'meta_styles/closing_block_only',
+        'meta_styles/yaml_style',
+        'meta_styles/jekyll_style',
+        'meta_styles/multi_line',
+        'meta_styles/no_meta',
+        'not_a_page',
+        'toc',
+    ])
+
+
+@pytest.mark.parametrize('renderer', list(filter(None, (
+    operator.methodcaller('upper'),
+    'string.upper' if not _PY3 else None,
+    _body_renderer,
+    _page_renderer,
+    _pages_renderer,
+))))
+def test_other_html_renderer(renderer):
+    pages = FlatPages(Flask(__name__))
+    pages.app.config['FLATPAGES_HTML_RENDERER'] = renderer
+    hello = pages.get('hello')
+    assert hello.body == u'Hello, *世界*!\n'
+    # Upper-case, markdown not interpreted
+    assert hello.html == u'HELLO, *世界*!\n'
@@ -0,0 +1,90 @@
+"""
+==============================
+tests.test_markdown_codehilite
+==============================
+
+Test Markdown rendering with the CodeHilite extension, which needs Pygments.
+
+"""
+
+import pytest
+from flask_flatpages.imports import PygmentsHtmlFormatter
+from markdown.extensions.codehilite import CodeHiliteExtension
+from markdown.extensions.toc import TocExtension
+
+from .test_markdown_extensions import (
+    check_codehilite_with_linenums,
+    check_default_codehilite_page,
+    check_extra,
+    check_toc_page,
+)
+
+
+pytestmark = pytest.mark.skipif(
+    PygmentsHtmlFormatter is None, reason='Pygments not installed'
+)
+
+_TOC_EXT = TocExtension()
+_CODEHILITE_EXT = CodeHiliteExtension()
+_CODEHILITE_LINENUMS_EXT = CodeHiliteExtension(linenums='True')
+_CODEHILITE_IMPORTPATH = 'markdown.extensions.codehilite:CodeHiliteExtension'
+
+
+@pytest.mark.parametrize('extension, configs, check', [
+    ('codehilite', {}, check_default_codehilite_page),
+    # explicitly disabled
+    (
+        'codehilite',
+        {'codehilite': {'linenums': 'False'}},
+        check_default_codehilite_page,
+    ),
+    (
+        'codehilite',
+        {'codehilite': {'linenums': 'True'}},
+        check_codehilite_with_linenums,
+    ),
+    (_CODEHILITE_IMPORTPATH, {}, check_default_codehilite_page),
+    # Markdown 3 style config
+    (
+        _CODEHILITE_IMPORTPATH,
+        {_CODEHILITE_IMPORTPATH: {'linenums': True}},
+        check_codehilite_with_linenums,
+    ),
+    (_CODEHILITE_EXT, {}, check_default_codehilite_page),
+    # Check config applies
+    (_CODEHILITE_LINENUMS_EXT, {}, check_codehilite_with_linenums),
+], ids=[
+    'default',
+    'disabled',
+    'enabled',
+    'importpath',
+    'importpath-enabled',
+    'object',
+    'object-enabled',
+])
+def test_codehilite_linenums(app, pages, extension, configs, check):
+    app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = [extension]
+    app.config['FLATPAGES_EXTENSION_CONFIGS'] = configs
+    pages.reload()
+    check(pages)
+
+
+def test_mixed_extension_types(app, pages):
+    app.config['FLATPAGES_MARKDOWN_EXTENSIONS'] = [
+        _TOC_EXT,
+        'codehilite',
+        'markdown.extensions.extra:ExtraExtension'
+    ]
+    pages.reload()
+    check_toc_page(pages)
+    check_default_codehilite_page(pages)
+    check_extra(pages)
+    app.config['FLATPAGES_EXTENSION_CONFIGS'] = {
+        'codehilite': {
+            'linenums': 'True'
+        }
+    }
+    pages.reload()
+    check_toc_page(pages)
+    check_extra(pages)
+    check_codehilite_with_linenums(pages)
@@ -10,48 +10,63 @@ Provide temp directory context manager and tests for it.
 import os
 import shutil
 import tempfile
-import unittest
-
 from contextlib import contextmanager
 
+import pytest
+
 
 @contextmanager
-def temp_directory():
+def temp_directory(parent=None):
     """
     This context manager gives the path to a new temporary directory that is
     deleted (with all it's content) at the end of the with block.
+
+    The directory is created in ``parent`` if given, else in the default
+    temporary directory.
     """
-    directory = tempfile.mkdtemp()
+    directory = tempfile.mkdtemp(dir=parent)
     try:
         yield directory
     finally:
-        shutil.rmtree(directory)
+        try:
+            # Most tests leave the directory empty
+            os.rmdir(directory)
+        except OSError:
+            shutil.rmtree(directory)
 
 
-class TestTempDirectory(unittest.TestCase):
+@pytest.fixture(scope='module')
+def temp_root():
+    """Parent of the directories created by the tests, removed once."""
+    with temp_directory() as root:
+        yield root
 
-    def test_exception(self):
-        try:
-            with temp_directory() as temp:
-                assert os.path.isdir(temp)
-                1/0
-        except ZeroDivisionError:
-            pass
-        else:
-            assert False, 'Exception did not propagate'
-        assert not os.path.exists(temp)
-
-    def test_removed(self):
-        with temp_directory() as temp:
+
+def test_exception(temp_root):
+    try:
+        with temp_directory(temp_root) as temp:
             assert os.path.isdir(temp)
-        # should be removed now
-        assert not os.path.exists(temp)
-
-    def test_writing(self):
-        with temp_directory() as temp:
-            filename = os.path.join(temp, 'foo')
-            with open(filename, 'w') as fd:
-                fd.write('foo')
-            assert os.path.isfile(filename)
-        assert not os.path.exists(temp)
-        assert not os.path.exists(filename)
+            raise ZeroDivisionError()
+    except ZeroDivisionError:
+        pass
+    else:
+        assert False, 'Exception did not propagate'
+    assert not os.path.exists(temp)
+
+
+def test_removed(temp_root):
+    with temp_directory(temp_root) as temp:
+        assert os.path.isdir(temp)
+        assert os.path.dirname(temp) == temp_root
+    # should be removed now
+    assert not os.path.exists(temp)
+
+
+def test_writing(temp_root):
+    with temp_directory(temp_root) as temp:
+        filename = os.path.join(temp, 'foo')
+        with open(filename, 'w') as fd:
+            fd.write('foo')
+        assert os.path.isfile(filename)
+    assert not os.path.exists(temp)
+    assert not os.path.exists(filename)